@@ -1,4 +1,65 @@
+import numpy as np
 import pandas as pd
+from numba import njit
+
+
+@njit(cache=True)
+def _touch(close, loc_idx, t1_idx, side, pt, sl, out_sl_idx, out_pt_idx):
+    """
+    Scans each event window [loc, t1] once and records the position of the first stop loss and profit taking touch.
+    Positions stay at -1 when the barrier is not touched.
+    """
+    for i in range(loc_idx.shape[0]):
+        loc = loc_idx[i]
+        for j in range(loc, t1_idx[i] + 1):
+            r = (close[j] / close[loc] - 1) * side[i]
+            if out_sl_idx[i] < 0 and r < sl[i]:
+                out_sl_idx[i] = j
+            if out_pt_idx[i] < 0 and r > pt[i]:
+                out_pt_idx[i] = j
+            if out_sl_idx[i] >= 0 and out_pt_idx[i] >= 0:
+                break
+
+
+@njit(cache=True, nogil=True)
+def _ewm_std(x, com):
+    """
+    Exponentially weighted bias-corrected standard deviation in a single online pass, matching pandas'
+    ewm(com=com).std() (adjust=True). The variance follows pandas' ewmcov update.
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    alpha = 1 / (1 + com)
+    old_wt_factor = 1 - alpha
+    mean = np.nan
+    cov = 0.0
+    sum_wt = 1.0
+    sum_wt2 = 1.0
+    old_wt = 1.0
+    for i in range(n):
+        cur = x[i]
+        is_observation = not np.isnan(cur)
+        if not np.isnan(mean):
+            sum_wt *= old_wt_factor
+            sum_wt2 *= old_wt_factor * old_wt_factor
+            old_wt *= old_wt_factor
+            if is_observation:
+                old_mean = mean
+                if mean != cur:
+                    mean = (old_wt * old_mean + cur) / (old_wt + 1.0)
+                d_old = old_mean - mean
+                d_new = cur - mean
+                cov = (old_wt * (cov + d_old * d_old) + d_new * d_new) / (old_wt + 1.0)
+                sum_wt += 1.0
+                sum_wt2 += 1.0
+                old_wt += 1.0
+        elif is_observation:
+            mean = cur
+        # Bias correction, undefined until two observations carry weight
+        denominator = sum_wt * sum_wt - sum_wt2
+        if not np.isnan(mean) and denominator > 0:
+            out[i] = np.sqrt(max(sum_wt * sum_wt / denominator * cov, 0.0))
+    return out
 
 
 class TripleBarrier:
@@ -45,7 +106,9 @@ class TripleBarrier:
         # get value by tiemstamps
         df = prices.loc[df.index] / prices.loc[df.values].values - 1
         # estimate rolling std
-        df = df.ewm(span=lookback).std()
+        df = pd.Series(
+            _ewm_std(df.to_numpy(dtype=np.float64), (lookback - 1) / 2), index=df.index
+        )
         return df
 
     @staticmethod
@@ -72,26 +135,29 @@ class TripleBarrier:
         # Apply Stop Loss / Profit Taking, if it takes place before t1 (end of event)
         events_ = events.loc[dates]
         out = events_[["t1"]].copy(deep=True)
+        trgt = events_["trgt"].to_numpy(dtype=np.float64)
         # Profit taking active
         if factor[0] > 0:
-            profit_taking = factor[0] * events_["trgt"]
+            profit_taking = factor[0] * trgt
         else:
-            profit_taking = pd.Series(index=events.index)
+            profit_taking = np.full(trgt.shape[0], np.nan)
         # Stop loss active
         if factor[1] > 0:
-            stop_loss = -factor[1] * events_["trgt"]
+            stop_loss = -factor[1] * trgt
         else:
-            stop_loss = pd.Series(index=events.index)
-        out["pt"] = pd.Series(dtype=events.index.dtype)
-        out["sl"] = pd.Series(dtype=events.index.dtype)
+            stop_loss = np.full(trgt.shape[0], np.nan)
         # Get events
-        for loc, vertical_barrier in events_["t1"].fillna(close.index[-1]).iteritems():
-            closing_prices = close[loc:vertical_barrier]
-            cum_returns = (closing_prices / close[loc] - 1) * events_.side[loc]
-            out.at[loc, "sl"] = cum_returns[cum_returns < stop_loss[loc]].index.min()
-            out.at[loc, "pt"] = cum_returns[
-                cum_returns > profit_taking[loc]
-            ].index.min()
+        close_arr = close.to_numpy(dtype=np.float64)
+        loc_idx = close.index.get_indexer(events_.index)
+        t1_idx = close.index.get_indexer(events_["t1"].fillna(close.index[-1]))
+        side = events_["side"].to_numpy(dtype=np.float64)
+        sl_idx = np.full(trgt.shape[0], -1, dtype=np.int64)
+        pt_idx = np.full(trgt.shape[0], -1, dtype=np.int64)
+        _touch(
+            close_arr, loc_idx, t1_idx, side, profit_taking, stop_loss, sl_idx, pt_idx
+        )
+        out["pt"] = close.index[pt_idx].where(pt_idx >= 0)
+        out["sl"] = close.index[sl_idx].where(sl_idx >= 0)
         return out
 
     def get_events(self, close, factor, target, vertical_barrier, side_prediction=None):
@@ -111,8 +177,7 @@ class TripleBarrier:
         first_touch_dates = self.touch_barrier(
             close=close, events=events, factor=factors, dates=events.index
         )
-        for ind in events.index:
-            events.at[ind, "t1"] = first_touch_dates.loc[ind, :].dropna().min()
+        events["t1"] = first_touch_dates[["t1", "pt", "sl"]].min(axis=1)
         if side_prediction is None:
             events = events.drop("side", axis=1)
         events["pt"] = factor[0]
@@ -125,40 +190,27 @@ class TripleBarrier:
         Bottom Horizontal Barrier: -1
         Vertical Barrier: 0
         """
-        store = []
-        for date_time, values in out_df.iterrows():
-            ret = values["ret"]
-            target = values["trgt"]
-            initial_price = close[close.index == date_time].values[0]
-            top_barrier = (
-                initial_price + initial_price * events.loc[date_time, "pt"] * target
-            )
-            btm_barrier = (
-                initial_price - initial_price * events.loc[date_time, "sl"] * target
-            )
-            pt_level_reached = ret > top_barrier
-            sl_level_reached = ret < btm_barrier
-            if pt_level_reached:
-                # Top Barrier Reached
-                store.append(1)
-            elif sl_level_reached:
-                # Bottom Barrier Reached
-                store.append(-1)
-            else:
-                # Vertical Barrier Reached
-                if self.label == 0:
-                    store.append(0)
-                elif self.label == 1:
-                    store.append(
-                        max(
-                            [
-                                (ret - initial_price) / (top_barrier - initial_price),
-                                (ret - initial_price) / (initial_price - btm_barrier),
-                            ],
-                            key=abs,
-                        )
-                    )
-        out_df["bin"] = store
+        ret = out_df["ret"].to_numpy(dtype=np.float64)
+        target = out_df["trgt"].to_numpy(dtype=np.float64)
+        # Resolve the event timestamps to integer positions once and index the raw arrays
+        close_pos = close.index.get_indexer(out_df.index)
+        events_pos = events.index.get_indexer(out_df.index)
+        initial_price = close.to_numpy(dtype=np.float64)[close_pos]
+        pt = events["pt"].to_numpy(dtype=np.float64)[events_pos]
+        sl = events["sl"].to_numpy(dtype=np.float64)[events_pos]
+        top_barrier = initial_price + initial_price * pt * target
+        btm_barrier = initial_price - initial_price * sl * target
+        if self.label == 1:
+            # Vertical Barrier Reached: signed ratio with the larger magnitude
+            to_top = (ret - initial_price) / (top_barrier - initial_price)
+            to_btm = (ret - initial_price) / (initial_price - btm_barrier)
+            vertical = np.where(np.abs(to_btm) > np.abs(to_top), to_btm, to_top)
+        else:
+            vertical = 0
+        # Top Barrier Reached: 1, Bottom Barrier Reached: -1
+        out_df["bin"] = np.where(
+            ret > top_barrier, 1, np.where(ret < btm_barrier, -1, vertical)
+        )
         return out_df
 
     def get_labels(self, triple_barrier_events, close):
@@ -167,15 +219,17 @@ class TripleBarrier:
         The ML Algorithm will be trained on the predicted labels.
         """
         events_ = triple_barrier_events.dropna(subset=["t1"])
-        all_dates = events_.index.union(other=events_["t1"].array).drop_duplicates()
-        prices = close.reindex(all_dates, method="bfill")
+        # Sorted unique event start and end dates in a single pass
+        dates = np.concatenate([events_.index.to_numpy(), events_["t1"].to_numpy()])
+        all_dates = pd.DatetimeIndex(np.unique(dates))
+        prices = close.reindex(all_dates, method="bfill").to_numpy(dtype=np.float64)
+        start_prices = prices[all_dates.get_indexer(events_.index)]
+        end_prices = prices[all_dates.get_indexer(events_["t1"])]
         out_df = pd.DataFrame(index=events_.index)
-        out_df["ret"] = prices.loc[events_["t1"].array].array
+        out_df["ret"] = end_prices
         out_df["trgt"] = events_["trgt"]
         out_df = self.barrier_touched(out_df, triple_barrier_events, close)
-        out_df["ret"] = (
-            prices.loc[events_["t1"].array].array / prices.loc[events_.index] - 1
-        )
+        out_df["ret"] = end_prices / start_prices - 1
         tb_cols = triple_barrier_events.columns
         if "side" in tb_cols:
             out_df["side"] = triple_barrier_events["side"]
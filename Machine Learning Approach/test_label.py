@@ -0,0 +1,20 @@
+import numpy as np
+import pandas as pd
+
+from label import TripleBarrier
+
+
+def test_get_daily_vol_matches_pandas_ewm_std():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-01", periods=1500)
+    prices = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 1500))), index=index)
+    prices.iloc[[3, 700]] = np.nan
+    lookback = 50
+    # returns over [t-1, t] built exactly as in get_daily_vol
+    prev = prices.index.searchsorted(prices.index - pd.Timedelta(days=1))
+    prev = prev[prev > 0]
+    end = prices.index[prices.shape[0] - prev.shape[0] :]
+    returns = prices.loc[end] / prices.iloc[prev - 1].values - 1
+    expected = returns.ewm(span=lookback).std()
+    result = TripleBarrier.get_daily_vol(prices, lookback=lookback)
+    pd.testing.assert_series_equal(result, expected, check_names=False, rtol=1e-10)
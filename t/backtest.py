@@ -1,7 +1,11 @@
+import numpy as np
 import pandas as pd
 import plotly.tools as tls
+from numba import njit, prange
 from plotly.offline import iplot
 
+__all__ = ["backtest", "buyandhold", "dca", "strategy"]
+
 
 class backtest:
     def __init__(self, base, close, start, period, positions_dict):
@@ -10,9 +14,23 @@ class backtest:
         start = pd.to_datetime(start)
         self.dc = dca(base, close, start, period)
         self.bh = buyandhold(base, close, start, period)
-        self.strats = dict()
+        end = start + pd.offsets.DateOffset(days=period)
+        d1 = close.sort_index(ascending=True)[start:end]
+        d1.columns = ["Close"]
+        frames = dict()
         for ind, values in positions_dict.items():
-            self.strats[ind] = strategy(base, close, values, start, period)
+            frames[ind] = d1.copy()
+            frames[ind]["Signal"] = values[start:end]
+        # Only the kernel runs in parallel, the frames are sliced and built on this thread
+        signals = np.array(
+            [frame["Signal"].to_numpy(dtype=np.float64) for frame in frames.values()]
+        ).reshape(len(frames), len(d1))
+        units, cash = strategies_nb(
+            d1["Close"].to_numpy(dtype=np.float64), signals, float(base)
+        )
+        self.strats = dict()
+        for k, (ind, frame) in enumerate(frames.items()):
+            self.strats[ind] = _add_holdings(frame, units[k], cash[k], base)
 
     def get_strat_stats(self, name):
         if name == "DollarCostAvg":
@@ -23,34 +41,33 @@ class backtest:
             return self.strats[name]
 
     def get_values(self):
-        all_values = pd.concat([self.dc.TotalValue, self.bh.TotalValue], axis=1)
-        all_values.columns = ["DollarCostAvg", "BuyandHold"]
-        for i in self.strats.keys():
-            all_values[i] = self.strats[i].TotalValue
-        return all_values
+        cols = {
+            "DollarCostAvg": self.dc.TotalValue,
+            "BuyandHold": self.bh.TotalValue,
+            **{k: v.TotalValue for k, v in self.strats.items()},
+        }
+        return pd.DataFrame(cols)
 
     def get_plot(self):
         d1 = self.get_values()
         d1.sort_index(ascending=True, inplace=True)
         fig = tls.make_subplots(rows=2, cols=1, shared_xaxes=True)
-        close = pd.DataFrame(self.dc.Close)
-        avgs = d1.columns
-        for col in avgs:
-            fig.append_trace(
-                {"x": d1.index, "y": d1[col], "type": "scatter", "name": col}, 1, 1
-            )
-        for col in ["Close"]:
+        close = self.dc.Close
+        for col, values in d1.items():
             fig.append_trace(
-                {
-                    "x": close.index,
-                    "y": close[col],
-                    "type": "scatter",
-                    "name": "Closing Price",
-                    "line": {"color": "#01DF3A"},
-                },
-                2,
-                1,
+                {"x": d1.index, "y": values, "type": "scatter", "name": col}, 1, 1
             )
+        fig.append_trace(
+            {
+                "x": close.index,
+                "y": close,
+                "type": "scatter",
+                "name": "Closing Price",
+                "line": {"color": "#01DF3A"},
+            },
+            2,
+            1,
+        )
         fig["layout"].update(
             height=500,
             title="Relationship between different Strategies",
@@ -64,28 +81,37 @@ class backtest:
 def buyandhold(base, close, start, period):
     end = start + pd.offsets.DateOffset(days=period)
     d1 = close.sort_index(ascending=True)[start:end]
-    d1.columns = ["Close"]
-    d1["Amount_Invested"] = 0
-    d1.loc[d1.head(1).index, "Amount_Invested"] = base
-    d1["TotalAmountInvested"] = d1["Amount_Invested"].cumsum()
-    d1["UnitInvested"] = d1["Amount_Invested"] / d1["Close"]
-    d1["TotalUnitInvested"] = d1["UnitInvested"].cumsum()
-    d1["TotalValue"] = d1["Close"] * d1["TotalUnitInvested"]
-    d1["Gain/Loss"] = d1["TotalValue"] - d1["TotalAmountInvested"]
-    return d1
+    close_arr = d1.iloc[:, 0].to_numpy(dtype=np.float64)
+    amount = np.zeros_like(close_arr)
+    amount[:1] = base
+    return _investment_frame(d1.index, close_arr, amount)
 
 
 def dca(base, close, start, period):
     end = start + pd.offsets.DateOffset(days=period)
     d1 = close.sort_index(ascending=True)[start:end]
-    d1.columns = ["Close"]
-    d1["Amount_Invested"] = base / len(d1)
-    d1["TotalAmountInvested"] = d1["Amount_Invested"].cumsum()
-    d1["UnitInvested"] = d1["Amount_Invested"] / d1["Close"]
-    d1["TotalUnitInvested"] = d1["UnitInvested"].cumsum()
-    d1["TotalValue"] = d1["Close"] * d1["TotalUnitInvested"]
-    d1["Gain/Loss"] = d1["TotalValue"] - d1["TotalAmountInvested"]
-    return d1
+    close_arr = d1.iloc[:, 0].to_numpy(dtype=np.float64)
+    amount = np.full_like(close_arr, base / len(d1))
+    return _investment_frame(d1.index, close_arr, amount)
+
+
+def _investment_frame(index, close_arr, amount):
+    total_amount = np.cumsum(amount)
+    units = amount / close_arr
+    total_units = np.cumsum(units)
+    total_value = close_arr * total_units
+    return pd.DataFrame(
+        {
+            "Close": close_arr,
+            "Amount_Invested": amount,
+            "TotalAmountInvested": total_amount,
+            "UnitInvested": units,
+            "TotalUnitInvested": total_units,
+            "TotalValue": total_value,
+            "Gain/Loss": total_value - total_amount,
+        },
+        index=index,
+    )
 
 
 def strategy(base, close, buy_signal, start, period):
@@ -93,48 +119,59 @@ def strategy(base, close, buy_signal, start, period):
     d1 = close.sort_index(ascending=True)[start:end]
     d1.columns = ["Close"]
     d1["Signal"] = buy_signal[start:end]
-    Signal = []
-    TotalValues = []
-    CashHelds = []
-    UnitsInvested = []
-    UnitsHeld = []
-    for row in d1.itertuples(index=True, name="Pandas"):
-        if len(Signal) == 0:
-            Amount_Invested = base
-            UnitInvested = Amount_Invested / row.Close
-            UnitsHeld = UnitInvested
-            CashHeld = 0
-            TotalValue = UnitInvested * row.Close
-        elif (row.Signal == 1 and Signal[-1] == 1) or (
-            row.Signal == 1 and len(Signal) == 1
-        ):
-            CashHeld = 0
-            UnitInvested = UnitsHeld
-            TotalValue = UnitInvested * row.Close
-        elif row.Signal == 1 and Signal[-1] != 1:
-            Amount_Invested = CashHelds[-1]
-            UnitInvested = Amount_Invested / row.Close
-            UnitsHeld = UnitInvested
-            CashHeld = 0
-            TotalValue = UnitInvested * row.Close
-        elif row.Signal != 1 and Signal[-1] != 1 and len(Signal) > 1:
-            UnitInvested = 0
-            CashHeld = CashHelds[-1]
-            TotalValue = 0
-        elif (row.Signal != 1 and Signal[-1] == 1) or (
-            row.Signal != 1 and len(Signal) == 1
-        ):
-            UnitInvested = 0
-            CashHeld = UnitsHeld * row.Close
-            UnitsHeld = 0
-            TotalValue = 0
-        Signal.append(row.Signal)
-        TotalValues.append(TotalValue)
-        UnitsInvested.append(UnitInvested)
-        CashHelds.append(CashHeld)
+    UnitsInvested, CashHelds = strategy_nb(
+        d1["Close"].to_numpy(dtype=np.float64),
+        d1["Signal"].to_numpy(dtype=np.float64),
+        float(base),
+    )
+    return _add_holdings(d1, UnitsInvested, CashHelds, base)
+
+
+def _add_holdings(d1, UnitsInvested, CashHelds, base):
+    TotalValues = UnitsInvested * d1["Close"].to_numpy(dtype=np.float64)
     d1["TotalUnitInvested"] = UnitsInvested
     d1["CashHeld"] = CashHelds
     d1["TotalInvestment"] = TotalValues
-    d1["TotalValue"] = d1["CashHeld"] + d1["TotalInvestment"]
+    d1["TotalValue"] = CashHelds + TotalValues
     d1["Gain/Loss"] = d1["TotalValue"] - base
     return d1
+
+
+@njit(cache=True, nogil=True)
+def strategy_nb(close, signal, base):
+    """
+    Units held and cash held per bar for a long-only strategy that is invested on the first bar and afterwards only
+    while Signal == 1. Units only change on buy edges (0 -> 1) and cash only on sell edges (1 -> 0).
+    """
+    n = close.shape[0]
+    units = np.zeros(n)
+    cash = np.zeros(n)
+    units_held = 0.0
+    cash_held = base
+    was_invested = False
+    for i in range(n):
+        invested = i == 0 or signal[i] == 1
+        if invested:
+            if not was_invested:
+                units_held = cash_held / close[i]
+            units[i] = units_held
+        else:
+            if was_invested:
+                cash_held = units_held * close[i]
+            cash[i] = cash_held
+        was_invested = invested
+    return units, cash
+
+
+@njit(cache=True, parallel=True)
+def strategies_nb(close, signals, base):
+    """
+    Runs strategy_nb for every row of a 2-D (strategies x bars) signal matrix, in parallel across strategies.
+    """
+    units = np.zeros(signals.shape)
+    cash = np.zeros(signals.shape)
+    for k in prange(signals.shape[0]):
+        units_k, cash_k = strategy_nb(close, signals[k], base)
+        units[k] = units_k
+        cash[k] = cash_k
+    return units, cash
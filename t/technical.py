@@ -1,5 +1,42 @@
+import operator
+
+import bottleneck as bn
 import pandas as pd
 import numpy as np
+from technical_nb import bollinger_bands_nb, ewm_mean, macd_nb, rsi_nb, shift
+
+__all__ = [
+    "rsi",
+    "stochastic_osc",
+    "williamsR",
+    "evm",
+    "awesome_osc",
+    "coppock_ind",
+    "ichimoku_cloud",
+    "bollinger_bands",
+    "daily_ma",
+    "macd",
+]
+
+
+def _asfloat64(s: pd.Series):
+    """
+    Materializes a Series as a C-contiguous float64 array, the layout expected by the kernels in technical_nb.
+    """
+    return np.ascontiguousarray(s.to_numpy(dtype=np.float64))
+
+
+def _move(func, a, window, min_count=None):
+    """
+    Applies a bottleneck moving window function, requiring a full window by default like pandas' rolling with the
+    default min_periods. Windows longer than the data are clipped instead of raising, giving all NaN when the data
+    holds fewer than min_count values.
+    """
+    if min_count is None:
+        min_count = window
+    if min_count > a.shape[0]:
+        return np.full(a.shape[0], np.nan)
+    return func(a, min(window, a.shape[0]), min_count=min_count)
 
 
 # Momentum Indicators
@@ -12,16 +49,8 @@ def rsi(close: pd.Series, rsi_period=14):
     """
     Measures recent trading strength, velocity of change in the trend, and magnitude of the move.
     """
-    delta = close.diff(1)
-    data = pd.DataFrame(delta)
-    gain = delta.mask(delta < 0, 0)
-    data["gain"] = gain
-    loss = delta.mask(delta > 0, 0)
-    data["loss"] = loss
-    avg_gain = gain.ewm(com=rsi_period - 1, min_periods=rsi_period).mean()
-    avg_loss = loss.ewm(com=rsi_period - 1, min_periods=rsi_period).mean()
-    data["rsi"] = 100 - (100 / (1 + abs(avg_gain / avg_loss)))
-    return data["rsi"]
+    out = rsi_nb(_asfloat64(close), operator.index(rsi_period))
+    return pd.Series(out, index=close.index, name="rsi")
 
 
 def stochastic_osc(
@@ -32,24 +61,18 @@ def stochastic_osc(
     k : Period difference for PercentK
     d : Length of moving average in periods for PercentD
     """
-    data = pd.DataFrame()
-    data["stok"] = np.nan
-    for i in range(len(high)):
-        index = high.index[i]
-        if i < k_period:
-            highrange = high[0:k_period]
-            lowrange = low[0:k_period]
-            data.loc[index, "stok"] = (
-                (close[i] - lowrange.min()) / (highrange.max() - lowrange.min())
-            ) * 100
-        else:
-            highrange = high[i + 1 - k_period : i + 1]
-            lowrange = low[i + 1 - k_period : i + 1]
-            data.loc[index, "stok"] = (
-                (close[i] - lowrange.min()) / (highrange.max() - lowrange.min())
-            ) * 100
-    STOD = data["stok"].ewm(span=d_period, min_periods=d_period, adjust=False).mean()
-    return STOD
+    k_period = operator.index(k_period)
+    d_period = operator.index(d_period)
+    lowest_low = _move(bn.move_min, _asfloat64(low), k_period, min_count=1)
+    highest_high = _move(bn.move_max, _asfloat64(high), k_period, min_count=1)
+    # The first k bars all use the range of the first k bars
+    first = min(k_period, len(high)) - 1
+    if first > 0:
+        lowest_low[:first] = lowest_low[first]
+        highest_high[:first] = highest_high[first]
+    stok = (_asfloat64(close) - lowest_low) / (highest_high - lowest_low) * 100
+    STOD = ewm_mean(stok, (d_period - 1) / 2, d_period, False)
+    return pd.Series(STOD, index=high.index, name="stok")
 
 
 def williamsR(high: pd.Series, low: pd.Series, close: pd.Series):
@@ -77,13 +100,11 @@ def awesome_osc(high: pd.Series, low: pd.Series, high_period=34, low_period=5):
     34 Period and 5 Period Simple Moving Average.
 
     """
-    fast_period = (
-        high.rolling(window=high_period).mean() + low.rolling(window=high_period).mean()
-    ) / 2
-    slow_period = (
-        high.rolling(window=low_period).mean() + low.rolling(window=low_period).mean()
-    ) / 2
-    return fast_period - slow_period
+    # Rolling the summed prices once per period halves the rolling work
+    mid = _asfloat64(high) + _asfloat64(low)
+    fast_period = _move(bn.move_mean, mid, high_period) / 2
+    slow_period = _move(bn.move_mean, mid, low_period) / 2
+    return pd.Series(fast_period - slow_period, index=high.index)
 
 
 def coppock_ind(values: pd.Series):
@@ -95,20 +116,16 @@ def coppock_ind(values: pd.Series):
     """
     ROC1 = values / values.shift(14) - 1
     ROC2 = values / values.shift(11) - 1
-    ROC3 = ROC1 + ROC2
-    ROC = ROC3
-    list_of_values = []
-    tmp2 = np.array([1, 2, 3, 4, 5, 6, 7, 8, 9, 10])
-    ROC = ROC.fillna(int(999))
-    ROC.rolling(window=10).apply(
-        lambda x: list_of_values.append(x.values) or 999, raw=False
-    )
-    buyCoppock = [np.nan] * 9
-    for i in list_of_values:
-        if 999 in i:
-            buyCoppock.append(np.nan)
-        else:
-            buyCoppock.append(sum(np.multiply(i, tmp2)))
+    ROC = (ROC1 + ROC2).to_numpy(dtype=np.float64)
+    # Weighted sum over a 10 period window, most recent value weighted 10 and oldest weighted 1
+    weights = np.arange(1, 11, dtype=np.float64)
+    missing = np.isnan(ROC)
+    buyCoppock = np.full(ROC.shape[0], np.nan)
+    if ROC.shape[0] >= 10:
+        weighted = np.convolve(np.where(missing, 0.0, ROC), weights[::-1], mode="valid")
+        # Windows touching a missing rate of change stay NaN
+        touched = np.convolve(missing, np.ones(10), mode="valid") > 0
+        buyCoppock[9:] = np.where(touched, np.nan, weighted)
     return buyCoppock
 
 
@@ -117,23 +134,22 @@ def ichimoku_cloud(high: pd.Series, low: pd.Series, close: pd.Series):
     The Ichimoku Cloud, also known as Ichimoku Kinko Hyo, is a versatile indicator that defines support and resistance,
     identifies trend direction, gauges momentum and provides trading signals.
     """
+    high_arr = _asfloat64(high)
+    low_arr = _asfloat64(low)
     # Tenkan-sen (Conversion Line)
-    nine_period_high = high.rolling(window=9).max()
-    nine_period_low = low.rolling(window=9).min()
-    tenkan_sen = (nine_period_high + nine_period_low) / 2
+    tenkan_sen = (_move(bn.move_max, high_arr, 9) + _move(bn.move_min, low_arr, 9)) / 2
     # Kijun-sen (Base Line)
-    twenty_six_period_high = high.rolling(window=26).max()
-    twenty_six_period_low = low.rolling(window=26).min()
-    kijun_sen = (twenty_six_period_high + twenty_six_period_low) / 2
+    kijun_sen = (_move(bn.move_max, high_arr, 26) + _move(bn.move_min, low_arr, 26)) / 2
     # Senkou Span A (Leading Span A)
-    senkou_span_a = ((tenkan_sen + kijun_sen) / 2).shift(26)
+    senkou_span_a = shift((tenkan_sen + kijun_sen) / 2, 26)
     # Senkou Span B (Leading Span B)
-    fifty_two_period_high = high.rolling(window=52).max()
-    fifty_two_period_low = low.rolling(window=52).min()
-    senkou_span_b = ((fifty_two_period_high + fifty_two_period_low) / 2).shift(26)
+    senkou_span_b = shift(
+        (_move(bn.move_max, high_arr, 52) + _move(bn.move_min, low_arr, 52)) / 2, 26
+    )
     # Chikou Span (Closing Price)
-    chikou_span = close.shift(26)
-    return tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span
+    chikou_span = shift(_asfloat64(close), 26)
+    lines = (tenkan_sen, kijun_sen, senkou_span_a, senkou_span_b, chikou_span)
+    return tuple(pd.Series(line, index=close.index) for line in lines)
 
 
 # Volatility Indicators
@@ -144,11 +160,8 @@ def bollinger_bands(close: pd.Series, window, std_scalar):
     """
     Bollinger bands: Measures the “highness” or “lowness” of price, relative to previous trades.
     """
-    rolling_mean = close.ewm(span=window).mean()
-    rolling_std = close.ewm(span=window).mean()
-    upper_band = rolling_mean + (rolling_std * std_scalar)
-    lower_band = rolling_mean - (rolling_std * std_scalar)
-    return rolling_mean, upper_band, lower_band
+    bands = bollinger_bands_nb(_asfloat64(close), float(window), float(std_scalar))
+    return tuple(pd.Series(band, index=close.index) for band in bands)
 
 
 # Trend Indicator
@@ -166,9 +179,5 @@ def macd(values: pd.Series):
     between two moving averages of a security's price. The MACD is calculated by subtracting the 26-period Exponential
     Moving Average (EMA) from the 12-period EMA.
     """
-    macd_value = (
-        values.ewm(span=12, min_periods=12, adjust=False).mean()
-        - values.ewm(span=26, min_periods=26, adjust=False).mean()
-    )
-    macdsignalline = macd_value.ewm(span=9, min_periods=9, adjust=False).mean()
-    return macd_value, macdsignalline
+    lines = macd_nb(_asfloat64(values))
+    return tuple(pd.Series(line, index=values.index) for line in lines)
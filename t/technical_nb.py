@@ -0,0 +1,133 @@
+import numpy as np
+from numba import njit
+
+# Numba kernels behind the indicators in technical.py
+# Every kernel takes C-contiguous float64 arrays and returns float64 arrays, so they can be called directly on
+# ndarrays and release the GIL while running.
+# Kernels are compiled once per argument signature and cached on disk (cache=True). Periods are passed as int and
+# scalars as float so that each kernel only ever compiles a single signature.
+
+
+@njit(cache=True, nogil=True)
+def shift(x, periods):
+    out = np.full(x.shape[0], np.nan)
+    if periods < x.shape[0]:
+        out[periods:] = x[: x.shape[0] - periods]
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ewm_mean(x, com, min_periods, adjust):
+    """
+    Exponentially weighted mean, matching pandas' ewm(com=com, min_periods=min_periods, adjust=adjust).mean().
+    """
+    n = x.shape[0]
+    out = np.full(n, np.nan)
+    if n == 0:
+        return out
+    alpha = 1 / (1 + com)
+    old_wt_factor = 1 - alpha
+    new_wt = 1.0 if adjust else alpha
+    weighted = x[0]
+    nobs = 0 if np.isnan(weighted) else 1
+    old_wt = 1.0
+    if nobs >= min_periods:
+        out[0] = weighted
+    for i in range(1, n):
+        cur = x[i]
+        is_observation = not np.isnan(cur)
+        if is_observation:
+            nobs += 1
+        if not np.isnan(weighted):
+            old_wt *= old_wt_factor
+            if not adjust and com == 1:
+                # pandas re-weights across missing values in this case
+                new_wt = 1.0 - old_wt
+            if is_observation:
+                if weighted != cur:
+                    weighted = (old_wt * weighted + new_wt * cur) / (old_wt + new_wt)
+                if adjust:
+                    old_wt += new_wt
+                else:
+                    old_wt = 1.0
+        elif is_observation:
+            weighted = cur
+        if nobs >= min_periods:
+            out[i] = weighted
+    return out
+
+
+@njit(cache=True, nogil=True)
+def ewm_mean_std(x, com, min_periods):
+    """
+    Exponentially weighted mean and bias-corrected standard deviation in a single online pass, matching pandas'
+    ewm(com=com, min_periods=min_periods).mean() and .std() (adjust=True). The variance follows pandas' ewmcov update.
+    """
+    n = x.shape[0]
+    out_m = np.full(n, np.nan)
+    out_s = np.full(n, np.nan)
+    min_periods = max(min_periods, 1)
+    alpha = 1 / (1 + com)
+    old_wt_factor = 1 - alpha
+    mean = np.nan
+    cov = 0.0
+    sum_wt = 1.0
+    sum_wt2 = 1.0
+    old_wt = 1.0
+    nobs = 0
+    for i in range(n):
+        cur = x[i]
+        is_observation = not np.isnan(cur)
+        if is_observation:
+            nobs += 1
+        if not np.isnan(mean):
+            sum_wt *= old_wt_factor
+            sum_wt2 *= old_wt_factor * old_wt_factor
+            old_wt *= old_wt_factor
+            if is_observation:
+                old_mean = mean
+                if mean != cur:
+                    mean = (old_wt * old_mean + cur) / (old_wt + 1.0)
+                d_old = old_mean - mean
+                d_new = cur - mean
+                cov = (old_wt * (cov + d_old * d_old) + d_new * d_new) / (old_wt + 1.0)
+                sum_wt += 1.0
+                sum_wt2 += 1.0
+                old_wt += 1.0
+        elif is_observation:
+            mean = cur
+        if nobs >= min_periods:
+            out_m[i] = mean
+            # Bias correction, undefined until two observations carry weight
+            denominator = sum_wt * sum_wt - sum_wt2
+            if denominator > 0:
+                out_s[i] = np.sqrt(max(sum_wt * sum_wt / denominator * cov, 0.0))
+    return out_m, out_s
+
+
+@njit(cache=True, nogil=True)
+def rsi_nb(close, rsi_period):
+    delta = np.full(close.shape[0], np.nan)
+    delta[1:] = close[1:] - close[:-1]
+    # Missing deltas stay NaN so the EWM skips them, losses are kept positive
+    gain = np.where(delta < 0, 0.0, delta)
+    loss = np.where(delta > 0, 0.0, -delta)
+    avg_gain = ewm_mean(gain, rsi_period - 1.0, rsi_period, True)
+    avg_loss = ewm_mean(loss, rsi_period - 1.0, rsi_period, True)
+    rs = avg_gain / avg_loss
+    return 100 - (100 / (1 + rs))
+
+
+@njit(cache=True, nogil=True)
+def bollinger_bands_nb(close, window, std_scalar):
+    mean, std = ewm_mean_std(close, (window - 1) / 2, 0)
+    upper_band = mean + (std * std_scalar)
+    lower_band = mean - (std * std_scalar)
+    return mean, upper_band, lower_band
+
+
+@njit(cache=True, nogil=True)
+def macd_nb(values):
+    macd_value = ewm_mean(values, 5.5, 12, False) - ewm_mean(values, 12.5, 26, False)
+    macdsignalline = ewm_mean(macd_value, 4.0, 9, False)
+    return macd_value, macdsignalline
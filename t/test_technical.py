@@ -0,0 +1,66 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from technical import bollinger_bands, macd, rsi, stochastic_osc
+
+
+@pytest.fixture
+def prices():
+    rng = np.random.default_rng(0)
+    index = pd.date_range("2015-01-01", periods=800)
+    close = pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.02, 800))), index=index)
+    high = close * (1 + rng.uniform(0, 0.02, 800))
+    low = close * (1 - rng.uniform(0, 0.02, 800))
+    close.iloc[[0, 100, 300, 301]] = np.nan
+    high.iloc[[40, 41, 200]] = np.nan
+    low.iloc[[45, 500]] = np.nan
+    return high, low, close
+
+
+def test_rsi_matches_pandas(prices):
+    _, _, close = prices
+    delta = close.diff(1)
+    gain = delta.mask(delta < 0, 0)
+    loss = delta.mask(delta > 0, 0)
+    avg_gain = gain.ewm(com=13, min_periods=14).mean()
+    avg_loss = loss.ewm(com=13, min_periods=14).mean()
+    expected = 100 - (100 / (1 + abs(avg_gain / avg_loss)))
+    pd.testing.assert_series_equal(rsi(close, 14), expected, check_names=False)
+
+
+def test_macd_matches_pandas(prices):
+    _, _, close = prices
+    expected_macd = (
+        close.ewm(span=12, min_periods=12, adjust=False).mean()
+        - close.ewm(span=26, min_periods=26, adjust=False).mean()
+    )
+    expected_signal = expected_macd.ewm(span=9, min_periods=9, adjust=False).mean()
+    macd_value, macdsignalline = macd(close)
+    pd.testing.assert_series_equal(macd_value, expected_macd, check_names=False)
+    pd.testing.assert_series_equal(macdsignalline, expected_signal, check_names=False)
+
+
+@pytest.mark.parametrize("k_period, d_period", [(14, 3), (5, 3), (14, 5)])
+def test_stochastic_osc_matches_pandas(prices, k_period, d_period):
+    high, low, close = prices
+    lowest_low = low.rolling(window=k_period, min_periods=1).min()
+    highest_high = high.rolling(window=k_period, min_periods=1).max()
+    # The first k bars all use the range of the first k bars
+    lowest_low.iloc[:k_period] = low.iloc[:k_period].min()
+    highest_high.iloc[:k_period] = high.iloc[:k_period].max()
+    stok = (close - lowest_low) / (highest_high - lowest_low) * 100
+    expected = stok.ewm(span=d_period, min_periods=d_period, adjust=False).mean()
+    result = stochastic_osc(high, low, close, k_period, d_period)
+    pd.testing.assert_series_equal(result, expected, check_names=False)
+    assert result.name == "stok"
+
+
+def test_bollinger_bands_matches_pandas(prices):
+    _, _, close = prices
+    mean = close.ewm(span=20).mean()
+    std = close.ewm(span=20).std()
+    rolling_mean, upper_band, lower_band = bollinger_bands(close, 20, 2)
+    pd.testing.assert_series_equal(rolling_mean, mean, check_names=False)
+    pd.testing.assert_series_equal(upper_band, mean + std * 2, check_names=False)
+    pd.testing.assert_series_equal(lower_band, mean - std * 2, check_names=False)